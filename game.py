@@ -12,13 +12,29 @@ Game Properties:
     - Perfect information: The entire board state is visible to both players
 
 Board Representation:
-    A 6x7 NumPy array where:
+    A pair of bitboards (bb_player_1, bb_player_2), one integer per player,
+    with a bit set for every cell occupied by that player's pieces.
+
+    Each column occupies HEIGHT = ROWS + 1 consecutive bits, bottom cell
+    first. The extra bit on top of every column is a sentinel that is never
+    set, so shifting a bitboard never carries a line across two columns:
+
+        col:  0  1  2  3  4  5  6
+             6 13 20 27 34 41 48    <- sentinel row
+             5 12 19 26 33 40 47    <- top
+             4 11 18 25 32 39 46
+             3 10 17 24 31 38 45
+             2  9 16 23 30 37 44
+             1  8 15 22 29 36 43
+             0  7 14 21 28 35 42    <- bottom
+
+    Pieces "drop" to the lowest available cell in a column. For display,
+    to_array() expands the bitboards into a 6x7 NumPy array where:
         0 = Empty cell
         1 = Player 1 (Human by default, uses 🔴)
         2 = Player 2 (AI by default, uses 🟡)
 
-    Row 0 is the TOP of the board, Row 5 is the BOTTOM.
-    Pieces "drop" to the lowest available row in a column.
+    Row 0 of that array is the TOP of the board, Row 5 is the BOTTOM.
 """
 
 import numpy as np
@@ -36,76 +52,135 @@ PLAYER_2 = 2
 WIN_LENGTH = 4
 
 
+# Bitboard layout (see module docstring)
+HEIGHT = ROWS + 1
+BOTTOM_MASK = sum(1 << (col * HEIGHT) for col in range(COLS))
+TOP_MASK = BOTTOM_MASK << (ROWS - 1)
+BOARD_MASK = BOTTOM_MASK * ((1 << ROWS) - 1)
+COLUMN_MASK = (1 << HEIGHT) - 1  # All bits of column 0
+
+# Bit index of every cell, laid out like the 6x7 display array
+_CELL_SHIFTS = np.array(
+    [[col * HEIGHT + (ROWS - 1 - row) for col in range(COLS)]
+     for row in range(ROWS)],
+    dtype=np.int64,
+)
+
+
+def _enumerate_lines():
+    """
+    Yield the bitmask of every line of 4 cells on the board.
+
+    Yields:
+        int: One mask per line, grouped by direction: 24 horizontal,
+             21 vertical, 12 diagonal (/) and 12 diagonal (\\).
+    """
+    for d_col, d_height in ((1, 0), (0, 1), (1, 1), (1, -1)):
+        for col in range(COLS):
+            for height in range(ROWS):
+                end_col = col + (WIN_LENGTH - 1) * d_col
+                end_height = height + (WIN_LENGTH - 1) * d_height
+                if end_col < COLS and 0 <= end_height < ROWS:
+                    yield sum(
+                        1 << ((col + i * d_col) * HEIGHT + height + i * d_height)
+                        for i in range(WIN_LENGTH)
+                    )
+
+
+# All 69 lines of 4, computed once at import
+WINNING_LINES = tuple(_enumerate_lines())
+
+
 def create_board():
     """
     Create and return an empty Connect Four board.
 
     Returns:
-        np.ndarray: A 6x7 array of zeros representing an empty board.
+        tuple[int, int]: Two empty bitboards, one per player.
     """
-    return np.zeros((ROWS, COLS), dtype=int)
+    return (0, 0)
 
 
 def get_legal_moves(board):
     """
     Determine which columns are available for a move.
 
-    A column is legal if its top row (row 0) is empty,
-    meaning there is at least one open cell.
+    A column is legal if its top cell is empty, meaning there is at
+    least one open cell. The free top cells of all columns are found
+    with a single mask, then read off one bit at a time.
 
     Args:
-        board (np.ndarray): The current board state.
+        board (tuple[int, int]): The current board state.
 
     Returns:
         list[int]: A list of column indices where a piece can be dropped.
     """
-    return [col for col in range(COLS) if board[0][col] == EMPTY]
+    free = ~(board[0] | board[1]) & TOP_MASK
+    moves = []
+    while free:
+        bit = free & -free
+        moves.append((bit.bit_length() - 1) // HEIGHT)
+        free ^= bit
+    return moves
 
 
 def make_move(board, col, player):
     """
     Drop a piece into the specified column for the given player.
 
-    The piece falls to the lowest available row in the column.
-    Returns a new board (does not modify the original).
+    The piece falls to the lowest available cell in the column: adding
+    the column's bottom bit to the occupancy mask carries up to the first
+    empty cell. Returns a new board (does not modify the original).
 
     Args:
-        board (np.ndarray): The current board state.
+        board (tuple[int, int]): The current board state.
         col (int): The column index to drop the piece into (0-6).
         player (int): The player making the move (PLAYER_1 or PLAYER_2).
 
     Returns:
-        np.ndarray: A new board state with the piece placed.
+        tuple[int, int]: A new board state with the piece placed.
 
     Raises:
         ValueError: If the column is full or out of bounds.
     """
     if col < 0 or col >= COLS:
         raise ValueError(f"Column {col} is out of bounds (0-{COLS - 1}).")
-    if board[0][col] != EMPTY:
+    mask = board[0] | board[1]
+    if mask & (1 << (col * HEIGHT + ROWS - 1)):
         raise ValueError(f"Column {col} is full.")
 
-    new_board = board.copy()
-    # Find the lowest empty row in this column
-    for row in range(ROWS - 1, -1, -1):
-        if new_board[row][col] == EMPTY:
-            new_board[row][col] = player
-            break
-    return new_board
+    new_mask = mask | (mask + (1 << (col * HEIGHT)))
+    move = new_mask ^ mask
+    if player == PLAYER_1:
+        return (board[0] | move, board[1])
+    return (board[0], board[1] | move)
 
 
-def _check_window(window, player):
+def has_won(bb):
     """
-    Check if a window of 4 cells constitutes a win for the given player.
+    Check whether a single player's bitboard contains 4 in a row.
+
+    For each direction, AND-ing the bitboard with itself shifted by one
+    step marks every pair of adjacent pieces; doing the same with the
+    pairs shifted by two steps marks every run of four. The four
+    directions are combined without branching.
 
     Args:
-        window (np.ndarray): A 1D array of 4 cell values.
-        player (int): The player to check for.
+        bb (int): One player's bitboard.
 
     Returns:
-        bool: True if all 4 cells belong to the player.
+        bool: True if the player has 4 connected pieces.
     """
-    return np.all(window == player)
+    vertical = bb & (bb >> 1)
+    horizontal = bb & (bb >> HEIGHT)
+    diagonal = bb & (bb >> (HEIGHT + 1))       # /
+    anti_diagonal = bb & (bb >> (HEIGHT - 1))  # \
+    return bool(
+        (vertical & (vertical >> 2))
+        | (horizontal & (horizontal >> (2 * HEIGHT)))
+        | (diagonal & (diagonal >> (2 * (HEIGHT + 1))))
+        | (anti_diagonal & (anti_diagonal >> (2 * (HEIGHT - 1))))
+    )
 
 
 def get_winner(board):
@@ -115,43 +190,15 @@ def get_winner(board):
     Checks all horizontal, vertical, and diagonal lines of 4.
 
     Args:
-        board (np.ndarray): The current board state.
+        board (tuple[int, int]): The current board state.
 
     Returns:
         int or None: The winning player (PLAYER_1 or PLAYER_2), or None.
     """
-    # Check horizontal windows
-    for row in range(ROWS):
-        for col in range(COLS - WIN_LENGTH + 1):
-            window = board[row, col:col + WIN_LENGTH]
-            for player in [PLAYER_1, PLAYER_2]:
-                if _check_window(window, player):
-                    return player
-
-    # Check vertical windows
-    for row in range(ROWS - WIN_LENGTH + 1):
-        for col in range(COLS):
-            window = board[row:row + WIN_LENGTH, col]
-            for player in [PLAYER_1, PLAYER_2]:
-                if _check_window(window, player):
-                    return player
-
-    # Check positively sloped diagonals (\)
-    for row in range(ROWS - WIN_LENGTH + 1):
-        for col in range(COLS - WIN_LENGTH + 1):
-            window = np.array([board[row + i][col + i] for i in range(WIN_LENGTH)])
-            for player in [PLAYER_1, PLAYER_2]:
-                if _check_window(window, player):
-                    return player
-
-    # Check negatively sloped diagonals (/)
-    for row in range(WIN_LENGTH - 1, ROWS):
-        for col in range(COLS - WIN_LENGTH + 1):
-            window = np.array([board[row - i][col + i] for i in range(WIN_LENGTH)])
-            for player in [PLAYER_1, PLAYER_2]:
-                if _check_window(window, player):
-                    return player
-
+    if has_won(board[0]):
+        return PLAYER_1
+    if has_won(board[1]):
+        return PLAYER_2
     return None
 
 
@@ -164,12 +211,12 @@ def is_terminal(board):
         - The board is full (draw)
 
     Args:
-        board (np.ndarray): The current board state.
+        board (tuple[int, int]): The current board state.
 
     Returns:
         bool: True if the game is over.
     """
-    return get_winner(board) is not None or len(get_legal_moves(board)) == 0
+    return get_winner(board) is not None or (board[0] | board[1]) == BOARD_MASK
 
 
 def utility(board, ai_player):
@@ -182,7 +229,7 @@ def utility(board, ai_player):
          0 if the game is a draw
 
     Args:
-        board (np.ndarray): The current (terminal) board state.
+        board (tuple[int, int]): The current (terminal) board state.
         ai_player (int): The player number of the AI (PLAYER_1 or PLAYER_2).
 
     Returns:
@@ -210,6 +257,83 @@ def get_opponent(player):
     return PLAYER_1 if player == PLAYER_2 else PLAYER_2
 
 
+def mirror(board):
+    """
+    Reflect the board left to right.
+
+    Each column's HEIGHT bits are moved as a block to the opposite
+    column, so column c of the result is column COLS - 1 - c of the
+    board. A position and its mirror image are strategically identical.
+
+    Args:
+        board (tuple[int, int]): The current board state.
+
+    Returns:
+        tuple[int, int]: The mirrored board state.
+    """
+    mirrored = []
+    for bb in board:
+        flipped = 0
+        for col in range(COLS):
+            shift = (COLS - 1 - 2 * col) * HEIGHT
+            bits = bb & (COLUMN_MASK << (col * HEIGHT))
+            flipped |= bits << shift if shift >= 0 else bits >> -shift
+        mirrored.append(flipped)
+    return tuple(mirrored)
+
+
+def to_array(board):
+    """
+    Expand a bitboard pair into the 6x7 array form of the board.
+
+    Args:
+        board (tuple[int, int]): The current board state.
+
+    Returns:
+        np.ndarray: A 6x7 int8 array of cell states (EMPTY, PLAYER_1,
+                    PLAYER_2), with row 0 at the top.
+    """
+    cells = np.zeros((ROWS, COLS), dtype=np.int8)
+    for player in (PLAYER_1, PLAYER_2):
+        cells[(board[player - 1] >> _CELL_SHIFTS) & 1 == 1] = player
+    return cells
+
+
+# ANSI color codes for print_board()
+_RED = "\033[91m"
+_YELLOW = "\033[93m"
+_BLUE = "\033[94m"
+_RESET = "\033[0m"
+_BOLD = "\033[1m"
+
+# Display symbol of each cell state, indexed by EMPTY, PLAYER_1, PLAYER_2
+SYMBOLS = ["⚫", f"{_RED}🔴{_RESET}", f"{_YELLOW}🟡{_RESET}"]
+
+
+def _render_board_template():
+    """
+    Build the board's display frame, with a '{}' slot for every cell.
+
+    Returns:
+        str: The frame and column numbers, with ROWS * COLS slots filled
+             row by row from the top.
+    """
+    frame = f"{_BLUE}{_BOLD}"
+    lines = [f"  {frame}╔{'═══╦' * (COLS - 1)}═══╗{_RESET}"]
+    for row_idx in range(ROWS):
+        lines.append(f"  {frame}║{_RESET}" + f" {{}} {frame}║{_RESET}" * COLS)
+        if row_idx < ROWS - 1:
+            lines.append(f"  {frame}╠{'═══╬' * (COLS - 1)}═══╣{_RESET}")
+    lines.append(f"  {frame}╚{'═══╩' * (COLS - 1)}═══╝{_RESET}")
+    lines.append("   " + "".join(
+        f" {_BOLD}{col + 1}{_RESET}   " for col in range(COLS)))
+    return "\n" + "\n".join(lines) + "\n"
+
+
+# Rendered once at import; print_board() only fills in the cells
+BOARD_TEMPLATE = _render_board_template()
+
+
 def print_board(board):
     """
     Display the board in the terminal with colored pieces.
@@ -222,35 +346,7 @@ def print_board(board):
     The column numbers are displayed below the board for easy reference.
 
     Args:
-        board (np.ndarray): The current board state.
+        board (tuple[int, int]): The current board state.
     """
-    # ANSI color codes
-    RED = "\033[91m"
-    YELLOW = "\033[93m"
-    BLUE = "\033[94m"
-    RESET = "\033[0m"
-    BOLD = "\033[1m"
-
-    symbols = {
-        EMPTY: "⚫",
-        PLAYER_1: f"{RED}🔴{RESET}",
-        PLAYER_2: f"{YELLOW}🟡{RESET}",
-    }
-
-    print()
-    print(f"  {BLUE}{BOLD}╔{'═══╦' * (COLS - 1)}═══╗{RESET}")
-    for row_idx, row in enumerate(board):
-        row_str = f"  {BLUE}{BOLD}║{RESET}"
-        for cell in row:
-            row_str += f" {symbols[cell]} {BLUE}{BOLD}║{RESET}"
-        print(row_str)
-        if row_idx < ROWS - 1:
-            print(f"  {BLUE}{BOLD}╠{'═══╬' * (COLS - 1)}═══╣{RESET}")
-    print(f"  {BLUE}{BOLD}╚{'═══╩' * (COLS - 1)}═══╝{RESET}")
-
-    # Column numbers
-    col_nums = "   "
-    for col in range(COLS):
-        col_nums += f" {BOLD}{col + 1}{RESET}   "
-    print(col_nums)
-    print()
+    print(BOARD_TEMPLATE.format(*[SYMBOLS[cell]
+                                  for cell in to_array(board).ravel()]))
@@ -6,11 +6,21 @@ The agent assumes the opponent plays optimally and selects actions to maximize
 its minimum guaranteed outcome.
 
 Key Features:
-    1. Recursive Minimax with alpha-beta pruning for efficient search
+    1. Minimax with alpha-beta pruning for efficient search
     2. Depth-limited search to handle the large game tree of Connect Four
-    3. Heuristic evaluation function for non-terminal board states
-    4. Move ordering (center-column preference) to improve pruning efficiency
-    5. Performance metrics tracking (nodes expanded, search time)
+    3. Heuristic evaluation function for non-terminal board states, with a
+       one-ply extension at the horizon when a win is threatened
+    4. Iterative deepening with move ordering (previous best move, killer
+       moves, center-column preference, history heuristic) to improve
+       pruning efficiency
+    5. Transposition table (Zobrist hashing) to reuse results for positions
+       reached through different move orders, shared between each position
+       and its left-right mirror image
+    6. Performance metrics tracking (nodes expanded, search time)
+    7. Opening book for the first moves of the game
+
+The search itself lives in minimax_core.py, which is compiled with Numba
+when it is available; this module is the Python-facing entry point.
 
 Algorithm Overview:
     - The Maximizing player (AI) aims to maximize the board evaluation.
@@ -21,242 +31,159 @@ Algorithm Overview:
       estimates the board's favorability instead of searching further.
 """
 
+import itertools
 import time
 import numpy as np
 from game import (
-    ROWS, COLS, EMPTY, WIN_LENGTH,
-    get_legal_moves, make_move, is_terminal, get_winner,
-    utility, get_opponent,
+    COLS, ROWS, PLAYER_1, PLAYER_2,
+    create_board, get_opponent, make_move, mirror, to_array,
+)
+from minimax_core import (
+    EXACT, NEG_INF, POS_INF, ZOBRIST,
+    minimax, order_moves, pop_move, push_move,
+    new_move_ordering_tables, new_transposition_table, tt_best_move, tt_store,
 )
 
 
-# ──────────────────────────────────────────────
-#  Heuristic Evaluation Function
-# ──────────────────────────────────────────────
-
-def _score_window(window, ai_player, opponent):
+def zobrist_hash(board):
     """
-    Evaluate a window of 4 cells and return a heuristic score.
-
-    Scoring criteria:
-        +100  : 4 AI pieces (win)
-        +10   : 3 AI pieces + 1 empty (strong threat)
-        +5    : 2 AI pieces + 2 empty (potential buildup)
-        -8    : 3 opponent pieces + 1 empty (must block)
-        -4    : 2 opponent pieces + 2 empty (opponent buildup)
+    Compute the Zobrist hash of a board from scratch.
 
-    The asymmetric scoring (blocking threats scored slightly lower than
-    own threats) encourages offensive play while still prioritizing defense.
+    The hash is the XOR of the keys of all occupied cells. During the
+    search it is updated incrementally by XOR-ing in the key of each
+    dropped piece instead.
 
     Args:
-        window (np.ndarray): Array of 4 cell values.
-        ai_player (int): The AI's player number.
-        opponent (int): The opponent's player number.
+        board (tuple[int, int]): The current board state.
 
     Returns:
-        int: The heuristic score for this window.
+        int: The position's hash.
     """
-    score = 0
-    ai_count = np.count_nonzero(window == ai_player)
-    opp_count = np.count_nonzero(window == opponent)
-    empty_count = np.count_nonzero(window == EMPTY)
+    cells = to_array(board)
+    board_hash = 0
+    for row, col in zip(*np.nonzero(cells)):
+        board_hash ^= int(ZOBRIST[cells[row, col] - 1, row, col])
+    return board_hash
 
-    if ai_count == 4:
-        score += 100
-    elif ai_count == 3 and empty_count == 1:
-        score += 10
-    elif ai_count == 2 and empty_count == 2:
-        score += 5
 
-    if opp_count == 3 and empty_count == 1:
-        score -= 8
-    elif opp_count == 2 and empty_count == 2:
-        score -= 4
+# ──────────────────────────────────────────────
+#  Opening Book
+# ──────────────────────────────────────────────
 
-    return score
+# Best reply to every opening of at most 2 pieces, keyed by the columns
+# played so far (Player 1 always moves first). Openings whose mirror image
+# comes first in this order are left out and filled in by symmetry.
+# Generated by generate_opening_moves() at depth 16; rerun it whenever the
+# search's scoring changes:
+#     python -c "import minimax; print(minimax.generate_opening_moves())"
+_OPENING_MOVES = {
+    (): 3,
+    (0,): 3, (1,): 3, (2,): 3, (3,): 3,
+    (0, 0): 3, (0, 1): 3, (0, 2): 3, (0, 3): 3, (0, 4): 3, (0, 5): 3,
+    (0, 6): 3,
+    (1, 0): 1, (1, 1): 3, (1, 2): 2, (1, 3): 3, (1, 4): 3, (1, 5): 3,
+    (1, 6): 3,
+    (2, 0): 3, (2, 1): 3, (2, 2): 3, (2, 3): 3, (2, 4): 3, (2, 5): 3,
+    (2, 6): 3,
+    (3, 0): 3, (3, 1): 3, (3, 2): 3, (3, 3): 3,
+}
+
+# Most pieces on the board for which the book is consulted
+OPENING_BOOK_PLIES = 2
+
+
+def _play_opening(moves):
+    """
+    Replay an opening from the empty board.
 
+    Args:
+        moves (tuple[int, ...]): The columns played, Player 1 first.
 
-def heuristic_evaluate(board, ai_player):
+    Returns:
+        tuple: (board, to_move) — the resulting board state and the
+               player whose turn it is.
     """
-    Evaluate a non-terminal board state using a heuristic function.
-
-    This function is used when the search depth limit is reached and the
-    board is not in a terminal state. It estimates the board's favorability
-    by examining every possible window of 4 cells across all directions.
+    board = create_board()
+    player = PLAYER_1
+    for col in moves:
+        board = make_move(board, col, player)
+        player = get_opponent(player)
+    return board, player
 
-    The evaluation considers:
-        1. Center column preference — pieces in the center column have
-           more potential connections, so they receive a bonus.
-        2. Horizontal windows — all consecutive 4-cell groups in each row.
-        3. Vertical windows — all consecutive 4-cell groups in each column.
-        4. Diagonal windows — both positive and negative slope diagonals.
 
-    Args:
-        board (np.ndarray): The current board state.
-        ai_player (int): The AI's player number.
+def _build_opening_book():
+    """
+    Key the book's openings, and their mirror images, by Zobrist hash.
 
     Returns:
-        float: A heuristic score (positive = favorable for AI,
-               negative = favorable for opponent).
+        dict[int, int]: Best column for each book position's hash.
     """
-    opponent = get_opponent(ai_player)
-    score = 0
+    book = {}
+    for moves, best_col in _OPENING_MOVES.items():
+        board, _ = _play_opening(moves)
+        book[zobrist_hash(board)] = best_col
+        book[zobrist_hash(mirror(board))] = COLS - 1 - best_col
+    return book
+
 
-    # Center column preference (center pieces have more connections)
-    center_col = COLS // 2
-    center_array = board[:, center_col]
-    center_count = np.count_nonzero(center_array == ai_player)
-    score += center_count * 6
+def generate_opening_moves(max_depth=16):
+    """
+    Search every book opening afresh, to regenerate _OPENING_MOVES.
 
-    # Score horizontal windows
-    for row in range(ROWS):
-        for col in range(COLS - WIN_LENGTH + 1):
-            window = board[row, col:col + WIN_LENGTH]
-            score += _score_window(window, ai_player, opponent)
+    This takes a minute or two at the default depth.
 
-    # Score vertical windows
-    for row in range(ROWS - WIN_LENGTH + 1):
-        for col in range(COLS):
-            window = board[row:row + WIN_LENGTH, col]
-            score += _score_window(window, ai_player, opponent)
+    Args:
+        max_depth (int): Search depth for each opening (default: 16).
 
-    # Score positively sloped diagonals (\)
-    for row in range(ROWS - WIN_LENGTH + 1):
-        for col in range(COLS - WIN_LENGTH + 1):
-            window = np.array([board[row + i][col + i] for i in range(WIN_LENGTH)])
-            score += _score_window(window, ai_player, opponent)
+    Returns:
+        dict[tuple[int, ...], int]: Best reply to each opening of at most
+        OPENING_BOOK_PLIES pieces, leaving out openings whose mirror
+        image comes first.
+    """
+    replies = {}
+    for n_moves in range(OPENING_BOOK_PLIES + 1):
+        for moves in itertools.product(range(COLS), repeat=n_moves):
+            if tuple(COLS - 1 - col for col in moves) < moves:
+                continue
+            board, to_move = _play_opening(moves)
+            replies[moves], _ = get_best_move(board, to_move, max_depth,
+                                              use_book=False)
+    return replies
 
-    # Score negatively sloped diagonals (/)
-    for row in range(WIN_LENGTH - 1, ROWS):
-        for col in range(COLS - WIN_LENGTH + 1):
-            window = np.array([board[row - i][col + i] for i in range(WIN_LENGTH)])
-            score += _score_window(window, ai_player, opponent)
 
-    return score
+OPENING_BOOK = _build_opening_book()
 
 
 # ──────────────────────────────────────────────
-#  Minimax Algorithm with Alpha-Beta Pruning
+#  Kernel Warm-Up
 # ──────────────────────────────────────────────
 
-def minimax(board, depth, maximizing, ai_player, alpha, beta, stats):
-    """
-    Recursive Minimax algorithm with alpha-beta pruning.
-
-    This function implements the core adversarial search logic:
-        - At MAX nodes (AI's turn): choose the action that maximizes value.
-        - At MIN nodes (opponent's turn): choose the action that minimizes value.
-        - Alpha-beta pruning: skip branches that cannot affect the outcome.
-
-    The search terminates when:
-        1. A terminal state is reached (win/loss/draw) → return utility
-        2. The depth limit is reached → return heuristic evaluation
-
-    Parameters:
-        board (np.ndarray): The current board state.
-        depth (int): Remaining search depth (decrements each level).
-        maximizing (bool): True if current player is the maximizer (AI).
-        ai_player (int): The AI's player number.
-        alpha (float): Best value the maximizer can guarantee (lower bound).
-        beta (float): Best value the minimizer can guarantee (upper bound).
-        stats (dict): Dictionary tracking 'nodes_expanded' count.
+# Set once the kernel has been compiled by _warm_up()
+_warmed_up = False
 
-    Returns:
-        float: The minimax value of this board state.
-
-    Algorithm:
-        ```
-        function MINIMAX(state, depth, isMax, α, β):
-            if TERMINAL(state) or depth == 0:
-                return EVALUATE(state)
-            if isMax:
-                value = -∞
-                for each action in ACTIONS(state):
-                    value = max(value, MINIMAX(result, depth-1, false, α, β))
-                    α = max(α, value)
-                    if α ≥ β: break   // β cutoff
-                return value
-            else:
-                value = +∞
-                for each action in ACTIONS(state):
-                    value = min(value, MINIMAX(result, depth-1, true, α, β))
-                    β = min(β, value)
-                    if α ≥ β: break   // α cutoff
-                return value
-        ```
-    """
-    stats["nodes_expanded"] += 1
-
-    # Base case: terminal state — return exact utility
-    if is_terminal(board):
-        winner = get_winner(board)
-        if winner == ai_player:
-            # Prefer faster wins (add depth bonus)
-            return 1000 + depth
-        elif winner is not None:
-            # Prefer slower losses (subtract depth penalty)
-            return -1000 - depth
-        else:
-            return 0  # Draw
-
-    # Base case: depth limit reached — return heuristic estimate
-    if depth == 0:
-        return heuristic_evaluate(board, ai_player)
-
-    # Get legal moves, ordered by center preference for better pruning
-    legal_moves = get_legal_moves(board)
-    legal_moves = _order_moves(legal_moves)
 
-    opponent = get_opponent(ai_player)
-
-    if maximizing:
-        # AI's turn: maximize the evaluation
-        max_eval = float("-inf")
-        for col in legal_moves:
-            child_board = make_move(board, col, ai_player)
-            eval_score = minimax(child_board, depth - 1, False,
-                                 ai_player, alpha, beta, stats)
-            max_eval = max(max_eval, eval_score)
-            alpha = max(alpha, eval_score)
-            if alpha >= beta:
-                break  # Beta cutoff — minimizer would never allow this
-        return max_eval
-    else:
-        # Opponent's turn: minimize the evaluation
-        min_eval = float("inf")
-        for col in legal_moves:
-            child_board = make_move(board, col, opponent)
-            eval_score = minimax(child_board, depth - 1, True,
-                                 ai_player, alpha, beta, stats)
-            min_eval = min(min_eval, eval_score)
-            beta = min(beta, eval_score)
-            if alpha >= beta:
-                break  # Alpha cutoff — maximizer would never allow this
-        return min_eval
-
-
-def _order_moves(moves):
+def _warm_up():
     """
-    Order moves by proximity to the center column.
+    Run a tiny search so that the kernel is compiled before it is timed.
 
-    Center columns are explored first because they typically lead to
-    stronger positions, which improves alpha-beta pruning efficiency.
-
-    Args:
-        moves (list[int]): List of legal column indices.
-
-    Returns:
-        list[int]: Sorted list with center columns first.
+    With a cold Numba cache, compiling takes a few seconds on the first
+    call; without this, that time would be reported as the first move's
+    search time. Without Numba this just costs a few dozen nodes.
     """
-    center = COLS // 2
-    return sorted(moves, key=lambda col: abs(col - center))
+    global _warmed_up
+    _warmed_up = True
+    board = create_board()
+    for col, player in ((3, PLAYER_1), (3, PLAYER_2), (2, PLAYER_1)):
+        board = make_move(board, col, player)
+    get_best_move(board, PLAYER_2, max_depth=2)
 
 
 # ──────────────────────────────────────────────
 #  Public API: Get Best Move
 # ──────────────────────────────────────────────
 
-def get_best_move(board, ai_player, max_depth=6):
+def get_best_move(board, ai_player, max_depth=6, time_limit=None,
+                  use_book=True):
     """
     Determine the best move for the AI using depth-limited Minimax
     with alpha-beta pruning.
@@ -264,11 +191,26 @@ def get_best_move(board, ai_player, max_depth=6):
     This is the entry point for the AI agent. It evaluates all legal moves
     and returns the column that leads to the highest minimax value.
 
+    The search is iteratively deepened: depth 1, 2, ..., max_depth are
+    searched in turn, and the best move of each iteration is recorded in
+    the transposition table so it is tried first by the next one. The
+    shallow iterations are cheap compared to the savings in pruning at
+    the final depth, and the deepest completed result is always available
+    if the search has to stop early.
+
+    In the first few moves of the game the best move is read from the
+    opening book instead, and no search is done.
+
     Args:
-        board (np.ndarray): The current board state.
+        board (tuple[int, int]): The current board state.
         ai_player (int): The AI's player number (PLAYER_1 or PLAYER_2).
         max_depth (int): Maximum search depth (default: 6).
                          Higher values = stronger play but slower.
+        time_limit (float or None): Optional time budget in seconds. Once
+                         it is used up, no further iteration is started
+                         and the deepest completed result is returned.
+        use_book (bool): Whether to consult the opening book (default:
+                         True).
 
     Returns:
         tuple: (best_column, stats_dict)
@@ -276,27 +218,79 @@ def get_best_move(board, ai_player, max_depth=6):
             - stats_dict (dict): Performance metrics:
                 - 'nodes_expanded' (int): Total nodes explored in the search.
                 - 'time_seconds' (float): Wall-clock time taken for the search.
-                - 'depth' (int): The search depth used.
+                - 'depth' (int): The deepest search depth completed
+                  (0 for a book move).
+
+    Raises:
+        ValueError: If the board is full.
     """
-    stats = {"nodes_expanded": 0}
+    board_hash = zobrist_hash(board)
+    ply = bin(board[0] | board[1]).count("1")  # Pieces on the board
+
+    # Opening book: only valid when it is the AI's turn to move
+    to_move = PLAYER_1 if ply % 2 == 0 else PLAYER_2
+    if use_book and ply <= OPENING_BOOK_PLIES and ai_player == to_move:
+        book_col = OPENING_BOOK.get(board_hash)
+        if book_col is not None:
+            return book_col, {
+                "nodes_expanded": 0, "time_seconds": 0.0, "depth": 0,
+            }
+
+    if not _warmed_up:
+        _warm_up()
+
+    nodes = np.zeros(1, dtype=np.int64)
+    tt_keys, tt_data = new_transposition_table()
+    killers, history = new_move_ordering_tables()
     start_time = time.time()
 
-    legal_moves = get_legal_moves(board)
-    legal_moves = _order_moves(legal_moves)
-
-    best_score = float("-inf")
-    best_col = legal_moves[0]  # Default to first legal move
-
-    for col in legal_moves:
-        child_board = make_move(board, col, ai_player)
-        score = minimax(child_board, max_depth - 1, False,
-                        ai_player, float("-inf"), float("inf"), stats)
-        if score > best_score:
-            best_score = score
-            best_col = col
+    # The players are fixed for the whole search
+    opponent = get_opponent(ai_player)
+    players = (ai_player, opponent)
+
+    # The board shared by the whole search: [bb_ai, bb_opp]
+    search_board = np.array(
+        (board[ai_player - 1], board[opponent - 1]), dtype=np.int64,
+    )
+    mask = board[0] | board[1]
+    mirror_hash = zobrist_hash(mirror(board))
+    root_moves = np.empty(COLS, dtype=np.int64)
+    if order_moves(root_moves, mask, -1, killers[ply], history[0]) == 0:
+        raise ValueError("No legal moves: the board is full.")
+    best_col = int(root_moves[0])
+    completed_depth = 0
+
+    for depth in range(1, max_depth + 1):
+        best_score = NEG_INF
+        tt_move = tt_best_move(tt_keys, tt_data, board_hash, mirror_hash)
+
+        n_moves = order_moves(root_moves, mask, tt_move,
+                              killers[ply], history[0])
+        for col in root_moves[:n_moves].tolist():
+            height = push_move(search_board, 0, col)
+            keys = ZOBRIST[ai_player - 1, ROWS - 1 - height]
+            child_hash = board_hash ^ int(keys[col])
+            child_mirror_hash = mirror_hash ^ int(keys[COLS - 1 - col])
+            score = minimax(search_board, child_hash, child_mirror_hash,
+                            depth - 1, False, players, best_score, POS_INF,
+                            tt_keys, tt_data, killers, history, nodes)
+            pop_move(search_board, 0, col, height)
+            if score > best_score:
+                best_score = score
+                best_col = col
+
+        tt_store(tt_keys, tt_data, board_hash, mirror_hash, best_score, depth,
+                 EXACT, best_col, True)
+        completed_depth = depth
+
+        if time_limit is not None and time.time() - start_time >= time_limit:
+            break
 
     elapsed = time.time() - start_time
-    stats["time_seconds"] = round(elapsed, 3)
-    stats["depth"] = max_depth
+    stats = {
+        "nodes_expanded": int(nodes[0]),
+        "time_seconds": round(elapsed, 3),
+        "depth": completed_depth,
+    }
 
     return best_col, stats
@@ -0,0 +1,782 @@
+"""
+minimax_core.py — JIT-Compiled Search Kernel
+
+This module contains the hot path of the Minimax search: heuristic
+evaluation, move generation, win detection, the transposition table and
+the iterative alpha-beta search itself. minimax.py wraps it with the
+public get_best_move() entry point.
+
+Everything here works on bitboards passed as plain 64-bit integers
+(see game.py for the layout) and on preallocated NumPy arrays, with no
+Python objects on the hot path. That lets Numba's @njit compile every
+function to machine code, removing the interpreter overhead from the
+hundreds of thousands of nodes expanded per move.
+
+Numba is optional: if it is not installed, the functions run unchanged
+as ordinary (much slower) Python.
+
+Conventions:
+    - Scores are integers; NEG_INF and POS_INF bound the alpha-beta window.
+    - Player numbers and board hashes follow game.py and minimax.py.
+    - stats is a one-element int64 array so the kernel can update the
+      node count in place.
+"""
+
+import numpy as np
+from game import (
+    ROWS, COLS, WIN_LENGTH,
+    HEIGHT, BOTTOM_MASK, BOARD_MASK, COLUMN_MASK, WINNING_LINES, has_won,
+)
+
+try:
+    from numba import njit
+except ImportError:  # Numba not installed: run the kernel as plain Python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+# Bounds of the alpha-beta window: plain ints beyond any reachable score
+# (wins are worth WIN_SCORE plus at most the search depth, heuristic
+# scores stay well below that), small enough for the table's int32 values
+NEG_INF = -10**9
+POS_INF = 10**9
+
+# Score of a won position, before the depth bonus/penalty
+WIN_SCORE = 1000
+
+CENTER_COL = COLS // 2
+
+
+# ──────────────────────────────────────────────
+#  Bitboard Primitives
+# ──────────────────────────────────────────────
+
+# game.has_won is pure integer arithmetic, so it compiles unchanged
+_has_won = njit(cache=True)(has_won)
+
+
+@njit(cache=True)
+def playable_cells(mask):
+    """
+    Find the cell a piece would land on in every column at once.
+
+    Adding the bottom bit of every column to the occupancy mask carries
+    each one up to the column's first empty cell. A full column carries
+    into its sentinel bit instead, which BOARD_MASK clears.
+
+    Args:
+        mask (int): Bitboard of all occupied cells.
+
+    Returns:
+        int: Bitboard with the landing cell of every non-full column set.
+    """
+    return (mask + BOTTOM_MASK) & BOARD_MASK
+
+
+@njit(cache=True)
+def column_height(mask, col):
+    """
+    Count the pieces already in a column.
+
+    A piece dropped into the column lands at bit (col * HEIGHT + height),
+    i.e. at display row (ROWS - 1 - height).
+
+    Args:
+        mask (int): Bitboard of all occupied cells.
+        col (int): The column index (0-6).
+
+    Returns:
+        int: The number of pieces in the column (0-6).
+    """
+    height = 0
+    while height < ROWS and mask & (1 << (col * HEIGHT + height)):
+        height += 1
+    return height
+
+
+@njit(cache=True)
+def push_move(board, side, col):
+    """
+    Drop a piece into a column, modifying the board in place.
+
+    The search shares one board between all nodes: each move is made
+    before descending into a child and undone with pop_move() after,
+    so no board is ever copied or allocated. (Unlike game.make_move(),
+    which takes a player number and returns a new board.)
+
+    Args:
+        board (np.ndarray): [bb_ai, bb_opp], updated in place.
+        side (int): 0 to move for the AI, 1 for the opponent.
+        col (int): The column index (0-6); must not be full.
+
+    Returns:
+        int: The landing height of the piece (see column_height()).
+    """
+    height = column_height(board[0] | board[1], col)
+    board[side] ^= 1 << (col * HEIGHT + height)
+    return height
+
+
+@njit(cache=True)
+def pop_move(board, side, col, height):
+    """
+    Take back the piece dropped by push_move(board, side, col).
+
+    Args:
+        board (np.ndarray): [bb_ai, bb_opp], updated in place.
+        side (int): 0 for the AI, 1 for the opponent; must match the
+                    push_move() call being undone.
+        col (int): The column the piece was dropped into (0-6).
+        height (int): The landing height push_move() returned.
+    """
+    board[side] ^= 1 << (col * HEIGHT + height)
+
+
+# ──────────────────────────────────────────────
+#  Heuristic Evaluation Function
+# ──────────────────────────────────────────────
+
+# Every window of 4 cells, as bitmasks (see game.WINNING_LINES)
+WINDOW_MASKS = np.array(WINNING_LINES, dtype=np.int64)
+CENTER_MASK = ((1 << ROWS) - 1) << (CENTER_COL * HEIGHT)
+
+
+@njit(cache=True)
+def _popcount(x):
+    """
+    Count the set bits of a non-negative 64-bit integer.
+
+    Branch-free SWAR reduction: bits are summed in pairs, then nibbles,
+    then bytes, and the byte sums are folded into the lowest byte. Shifts
+    and adds only, so it cannot overflow int64 with or without Numba.
+    """
+    x = x - ((x >> 1) & 0x5555555555555555)
+    x = (x & 0x3333333333333333) + ((x >> 2) & 0x3333333333333333)
+    x = (x + (x >> 4)) & 0x0F0F0F0F0F0F0F0F
+    x = x + (x >> 8)
+    x = x + (x >> 16)
+    x = x + (x >> 32)
+    return x & 0x7F
+
+
+def _score_window(ai_count, opp_count):
+    """
+    Evaluate a window of 4 cells and return a heuristic score.
+
+    Scoring criteria:
+        +100  : 4 AI pieces (win)
+        +10   : 3 AI pieces + 1 empty (strong threat)
+        +5    : 2 AI pieces + 2 empty (potential buildup)
+        -8    : 3 opponent pieces + 1 empty (must block)
+        -4    : 2 opponent pieces + 2 empty (opponent buildup)
+
+    The asymmetric scoring (blocking threats scored slightly lower than
+    own threats) encourages offensive play while still prioritizing defense.
+
+    Args:
+        ai_count (int): Number of AI pieces in the window.
+        opp_count (int): Number of opponent pieces in the window.
+
+    Returns:
+        int: The heuristic score for this window.
+    """
+    score = 0
+    empty_count = WIN_LENGTH - ai_count - opp_count
+
+    if ai_count == 4:
+        score += 100
+    elif ai_count == 3 and empty_count == 1:
+        score += 10
+    elif ai_count == 2 and empty_count == 2:
+        score += 5
+
+    if opp_count == 3 and empty_count == 1:
+        score -= 8
+    elif opp_count == 2 and empty_count == 2:
+        score -= 4
+
+    return score
+
+
+# Window score for every (ai_count, opp_count) pair, indexed [ai, opp]
+SCORE_LUT = np.array(
+    [[_score_window(ai, opp) if ai + opp <= WIN_LENGTH else 0
+      for opp in range(WIN_LENGTH + 1)]
+     for ai in range(WIN_LENGTH + 1)],
+    dtype=np.int64,
+)
+
+
+@njit(cache=True)
+def heuristic_evaluate(bb_ai, bb_opp):
+    """
+    Evaluate a non-terminal board state using a heuristic function.
+
+    The evaluation considers:
+        1. Center column preference — each AI piece in the center column
+           earns a bonus, since it has more potential connections.
+        2. Every horizontal, vertical and diagonal window of 4 cells,
+           scored by _score_window() via SCORE_LUT.
+
+    The pieces in a window are counted by masking each bitboard with the
+    window's mask and taking the population count.
+
+    A board where either player already has 4 in a row is decided, so
+    it is scored as a win or loss (±WIN_SCORE) without scanning the
+    windows. The search never evaluates such a board, since it checks
+    for wins first, but other callers may.
+
+    Args:
+        bb_ai (int): The AI's bitboard.
+        bb_opp (int): The opponent's bitboard.
+
+    Returns:
+        int: A heuristic score (positive = favorable for AI,
+             negative = favorable for opponent).
+    """
+    # Decided positions: one branch-free test per player
+    if _has_won(bb_ai):
+        return WIN_SCORE
+    if _has_won(bb_opp):
+        return -WIN_SCORE
+
+    # Center column preference (center pieces have more connections)
+    score = _popcount(bb_ai & CENTER_MASK) * 6
+
+    # Score all horizontal, vertical and diagonal windows
+    for mask in WINDOW_MASKS:
+        score += SCORE_LUT[_popcount(bb_ai & mask), _popcount(bb_opp & mask)]
+
+    return score
+
+
+# ──────────────────────────────────────────────
+#  Transposition Table (Zobrist Hashing)
+# ──────────────────────────────────────────────
+
+# Transposition table entry flags
+EXACT = 0  # Stored value is the exact minimax value
+LOWER = 1  # Stored value is a lower bound (search failed high)
+UPPER = 2  # Stored value is an upper bound (search failed low)
+
+# One random 63-bit key per (player, row, col); seeded for reproducibility.
+# Keys are kept non-negative so hashes index the table with a plain AND.
+ZOBRIST = np.random.default_rng(20240601).integers(
+    0, np.iinfo(np.int64).max, size=(2, ROWS, COLS), dtype=np.int64,
+)
+
+# A position and its left-right mirror image have the same value, so both
+# share one entry: the table is keyed by the smaller of the position's hash
+# and its mirror hash (the hash with every column c read as COLS - 1 - c).
+# Best moves of positions keyed by their mirror hash are stored mirrored.
+
+# Number of table slots (a power of two, indexed by hash & TT_MASK)
+TT_SIZE = 1 << 18
+TT_MASK = TT_SIZE - 1
+
+# Columns of the table's data array
+TT_VALUE = 0
+TT_DEPTH = 1
+TT_FLAG = 2
+TT_MOVE = 3
+TT_EXTENDED = 4  # 1 if a depth-0 result includes the threat extension
+
+
+def new_transposition_table():
+    """
+    Allocate an empty transposition table.
+
+    The table is open-addressed by key & TT_MASK and always keeps the
+    most recent entry for a slot. An empty slot has depth -1, so it never
+    satisfies a lookup, and move -1 (no best move).
+
+    Returns:
+        tuple: (tt_keys, tt_data)
+            - tt_keys (np.ndarray): Full key stored in each slot.
+            - tt_data (np.ndarray): (TT_SIZE, 5) array of
+              (value, depth, flag, best_move, extended) per slot.
+    """
+    tt_keys = np.zeros(TT_SIZE, dtype=np.int64)
+    tt_data = np.full((TT_SIZE, 5), -1, dtype=np.int32)
+    return tt_keys, tt_data
+
+
+@njit(cache=True)
+def _tt_key(board_hash, mirror_hash):
+    """
+    Choose the key a position is stored under in the transposition table.
+
+    A position and its mirror image share one entry, keyed by the
+    smaller of the two hashes.
+
+    Args:
+        board_hash (int): Zobrist hash of the position.
+        mirror_hash (int): Zobrist hash of its mirror image.
+
+    Returns:
+        tuple: (key, mirrored)
+            - key (int): The table key for the position.
+            - mirrored (bool): True if the key is the mirror hash, in
+              which case the entry's best move is stored mirrored.
+    """
+    if mirror_hash < board_hash:
+        return mirror_hash, True
+    return board_hash, False
+
+
+@njit(cache=True)
+def tt_store(tt_keys, tt_data, board_hash, mirror_hash, value, depth, flag,
+             move, extended):
+    """
+    Store a search result for a position in the transposition table.
+
+    The entry always replaces whatever occupied its slot. When the
+    position is keyed by its mirror hash, the best move is stored
+    mirrored (column c as COLS - 1 - c); tt_best_move() and the probe in
+    minimax() mirror it back.
+
+    Args:
+        tt_keys (np.ndarray): Key array from new_transposition_table().
+        tt_data (np.ndarray): Data array from new_transposition_table().
+        board_hash (int): Zobrist hash of the position.
+        mirror_hash (int): Zobrist hash of its mirror image.
+        value (int): The search result.
+        depth (int): Remaining depth the position was searched to.
+        flag (int): EXACT, LOWER or UPPER: whether value is the exact
+                    minimax value or a bound on it.
+        move (int): Best move found, as a column of this position (not
+                    of its mirror image), or -1 for none.
+        extended (bool): False only for results computed inside a
+                         threat extension, which skip the extension a
+                         depth-0 node would otherwise get and so may not
+                         be reused for one outside it.
+    """
+    key, mirrored = _tt_key(board_hash, mirror_hash)
+    if mirrored and move >= 0:
+        move = COLS - 1 - move
+    slot = key & TT_MASK
+    tt_keys[slot] = key
+    tt_data[slot, TT_VALUE] = value
+    tt_data[slot, TT_DEPTH] = depth
+    tt_data[slot, TT_FLAG] = flag
+    tt_data[slot, TT_MOVE] = move
+    tt_data[slot, TT_EXTENDED] = extended
+
+
+@njit(cache=True)
+def tt_best_move(tt_keys, tt_data, board_hash, mirror_hash):
+    """
+    Look up the best move stored for a position.
+
+    Args:
+        tt_keys (np.ndarray): Key array from new_transposition_table().
+        tt_data (np.ndarray): Data array from new_transposition_table().
+        board_hash (int): Zobrist hash of the position.
+        mirror_hash (int): Zobrist hash of its mirror image.
+
+    Returns:
+        int: The stored best move as a column of this position (mirrored
+             back if the entry is keyed by the mirror hash), or -1 if the
+             position has no entry or no best move.
+    """
+    key, mirrored = _tt_key(board_hash, mirror_hash)
+    slot = key & TT_MASK
+    if tt_keys[slot] != key or tt_data[slot, TT_MOVE] < 0:
+        return -1
+    if mirrored:
+        return COLS - 1 - tt_data[slot, TT_MOVE]
+    return tt_data[slot, TT_MOVE]
+
+
+# ──────────────────────────────────────────────
+#  Move Ordering (Killer Moves and History)
+# ──────────────────────────────────────────────
+
+# Columns from the center outwards; the columns of each pair after the
+# first are equally central
+CENTER_ORDER = np.array(
+    sorted(range(COLS), key=lambda col: abs(col - CENTER_COL)), dtype=np.int64,
+)
+
+
+def new_move_ordering_tables():
+    """
+    Allocate empty killer-move and history tables.
+
+    Killer moves are the last two moves that caused a cutoff at a given
+    ply (the number of pieces on the board); history scores accumulate
+    depth * depth for every cutoff a column causes, per side.
+
+    Returns:
+        tuple: (killers, history)
+            - killers (np.ndarray): (ROWS * COLS + 1, 2) columns, -1 = none.
+            - history (np.ndarray): (2, COLS) cutoff scores per side.
+    """
+    killers = np.full((ROWS * COLS + 1, 2), -1, dtype=np.int64)
+    history = np.zeros((2, COLS), dtype=np.int64)
+    return killers, history
+
+
+@njit(cache=True)
+def order_moves(out, mask, tt_move, killers, history):
+    """
+    Order moves to try the most promising ones first.
+
+    Moves are tried in the order:
+        1. The best move recorded in the transposition table: the best
+           move of a shallower search is usually the best move of a
+           deeper one too.
+        2. The two killer moves: moves that caused a cutoff in a sibling
+           position at the same ply often cut off here as well.
+        3. The remaining moves by proximity to the center column, since
+           center columns typically lead to stronger positions.
+        4. Ties by history score, highest first. (Ranking history above
+           center distance expanded more nodes in measurements.)
+
+    The center-distance order is the fixed CENTER_ORDER, so no sort is
+    needed: it is walked once, skipping full columns and moves already
+    placed, and only the two columns of an equally central pair can
+    swap places.
+
+    Args:
+        out (np.ndarray): Array of at least COLS entries that receives
+                          the ordered moves.
+        mask (int): Bitboard of all occupied cells.
+        tt_move (int): Best move stored for this position, or -1.
+        killers (np.ndarray): The two killer moves for this ply.
+        history (np.ndarray): History scores for the side to move.
+
+    Returns:
+        int: The number of legal moves written to out, most promising
+             first.
+    """
+    playable = playable_cells(mask)
+    placed = 0  # Bit c is set once column c is in out
+    n_moves = 0
+    for i in range(3):
+        col = int(tt_move) if i == 0 else int(killers[i - 1])
+        if (col >= 0 and not placed & (1 << col)
+                and playable & (COLUMN_MASK << (col * HEIGHT))):
+            out[n_moves] = col
+            placed |= 1 << col
+            n_moves += 1
+
+    first_ranked = n_moves
+    for col in CENTER_ORDER:
+        legal = playable & (COLUMN_MASK << (col * HEIGHT))
+        if not legal or placed & (1 << col):
+            continue
+        out[n_moves] = col
+        prev = out[n_moves - 1]
+        if (n_moves > first_ranked
+                and abs(prev - CENTER_COL) == abs(col - CENTER_COL)
+                and history[col] > history[prev]):
+            out[n_moves - 1] = col
+            out[n_moves] = prev
+        n_moves += 1
+    return n_moves
+
+
+@njit(cache=True)
+def _record_cutoff(killers, history, col, depth):
+    """
+    Credit a move that caused a cutoff in the killer and history tables.
+
+    The move becomes the first killer for its ply, pushing the previous
+    first killer to second place, and its history score grows by
+    depth * depth, so cutoffs high in the tree count for more.
+
+    Args:
+        killers (np.ndarray): The two killer moves for the cutoff's ply,
+                              updated in place.
+        history (np.ndarray): History scores for the side that made the
+                              move, updated in place.
+        col (int): The column that caused the cutoff.
+        depth (int): Remaining depth of the node where it happened.
+    """
+    if killers[0] != col:
+        killers[1] = killers[0]
+        killers[0] = col
+    history[col] += depth * depth
+
+
+# ──────────────────────────────────────────────
+#  Minimax Algorithm with Alpha-Beta Pruning
+# ──────────────────────────────────────────────
+
+@njit(cache=True)
+def minimax(board, board_hash, mirror_hash, depth, maximizing, players,
+            alpha, beta, tt_keys, tt_data, killers, history, stats):
+    """
+    Minimax algorithm with alpha-beta pruning, on an explicit stack.
+
+    This function implements the core adversarial search logic:
+        - At MAX nodes (AI's turn): choose the action that maximizes value.
+        - At MIN nodes (opponent's turn): choose the action that minimizes value.
+        - Alpha-beta pruning: skip branches that cannot affect the outcome.
+
+    The search terminates when:
+        1. A terminal state is reached (win/loss/draw) → return utility
+        2. The depth limit is reached → return heuristic evaluation
+        3. The transposition table already holds a value for this position
+           searched at least as deep → return the stored value
+
+    When the depth limit is reached while the player to move can win
+    at once, the leaf is scored as that win. Otherwise, if the player
+    who just moved threatens to win on their next move, the heuristic
+    would miss the threat (the horizon effect). Such a leaf is extended
+    by one ply over just the blocking moves instead. Nodes inside an
+    extension are not extended again, and their transposition table
+    entries are marked so they are not reused for a depth-0 node that
+    still could be.
+
+    Rather than recursing, the search keeps one frame per level of the
+    current line of play in preallocated arrays (level 0 is the node this
+    function was called on). Descending into a child pushes a frame;
+    when a node's value is known, its frame is popped and the value is
+    backed up into the parent, which then resumes with its next move.
+    This avoids a function call per node and has no recursion limit.
+
+    Parameters:
+        board (np.ndarray): [bb_ai, bb_opp], the AI's and the opponent's
+                            bitboards. Moves are made and undone in
+                            place; it is unchanged on return.
+        board_hash (int): Zobrist hash of the board.
+        mirror_hash (int): Zobrist hash of the board's mirror image.
+        depth (int): Remaining search depth (decrements each level).
+        maximizing (bool): True if current player is the maximizer (AI).
+        players (tuple[int, int]): (ai_player, opponent), fixed for the
+                                   whole search.
+        alpha (int): Best value the maximizer can guarantee (lower bound).
+        beta (int): Best value the minimizer can guarantee (upper bound).
+        tt_keys, tt_data (np.ndarray): The transposition table.
+        killers, history (np.ndarray): The move ordering tables.
+        stats (np.ndarray): One-element array counting nodes expanded.
+
+    Returns:
+        int: The minimax value of this board state.
+
+    Algorithm:
+        ```
+        function MINIMAX(state, depth, isMax, α, β):
+            if TERMINAL(state) or depth == 0:
+                return EVALUATE(state)
+            if isMax:
+                value = -∞
+                for each action in ACTIONS(state):
+                    value = max(value, MINIMAX(result, depth-1, false, α, β))
+                    α = max(α, value)
+                    if α ≥ β: break   // β cutoff
+                return value
+            else:
+                value = +∞
+                for each action in ACTIONS(state):
+                    value = min(value, MINIMAX(result, depth-1, true, α, β))
+                    β = min(β, value)
+                    if α ≥ β: break   // α cutoff
+                return value
+        ```
+    """
+    # Stack frames, indexed by level (one extra for a threat extension)
+    n_levels = depth + 2
+    hashes = np.empty(n_levels, dtype=np.int64)
+    mirror_hashes = np.empty(n_levels, dtype=np.int64)
+    depths = np.empty(n_levels, dtype=np.int64)
+    alphas = np.empty(n_levels, dtype=np.int64)
+    betas = np.empty(n_levels, dtype=np.int64)
+    alpha_origs = np.empty(n_levels, dtype=np.int64)
+    beta_origs = np.empty(n_levels, dtype=np.int64)
+    values = np.empty(n_levels, dtype=np.int64)
+    best_moves = np.empty(n_levels, dtype=np.int64)
+    plies = np.empty(n_levels, dtype=np.int64)
+    moves = np.empty((n_levels, COLS), dtype=np.int64)
+    n_moves = np.empty(n_levels, dtype=np.int64)
+    next_move = np.empty(n_levels, dtype=np.int64)
+    heights = np.empty(n_levels, dtype=np.int64)
+    extending = np.zeros(n_levels, dtype=np.bool_)   # Node is an extension
+    in_extension = np.zeros(n_levels, dtype=np.bool_)  # Below an extension
+
+    level = 0
+    hashes[0] = board_hash
+    mirror_hashes[0] = mirror_hash
+    depths[0] = depth
+    alphas[0] = alpha
+    betas[0] = beta
+    entering = True
+    returning = False
+    result = 0
+
+    while True:
+        # MAX and MIN levels alternate down the stack
+        is_max = (level % 2 == 0) == maximizing
+
+        if entering:
+            # ── Enter the node on top of the stack ──
+            entering = False
+            stats[0] += 1
+            node_key, mirrored = _tt_key(hashes[level], mirror_hashes[level])
+            node_depth = depths[level]
+            node_alpha = alphas[level]
+            node_beta = betas[level]
+
+            # Transposition table lookup: reuse a result searched at least
+            # this deep
+            slot = node_key & TT_MASK
+            tt_move = -1
+            if tt_keys[slot] == node_key:
+                tt_move = tt_data[slot, TT_MOVE]
+                if mirrored and tt_move >= 0:
+                    tt_move = COLS - 1 - tt_move
+                usable = (tt_data[slot, TT_DEPTH] > node_depth
+                          or (tt_data[slot, TT_DEPTH] == node_depth
+                              and (tt_data[slot, TT_EXTENDED] == 1
+                                   or in_extension[level])))
+                if usable:
+                    value = tt_data[slot, TT_VALUE]
+                    flag = tt_data[slot, TT_FLAG]
+                    if flag == EXACT:
+                        result = value
+                        returning = True
+                    else:
+                        if flag == LOWER:
+                            node_alpha = max(node_alpha, value)
+                        else:
+                            node_beta = min(node_beta, value)
+                        if node_alpha >= node_beta:
+                            result = value
+                            returning = True
+
+            mask = board[0] | board[1]
+            if not returning:
+                # Base case: terminal state — return exact utility. Only
+                # the player who just moved can have completed a line of 4.
+                if is_max and _has_won(board[1]):
+                    # Prefer slower losses (subtract depth penalty)
+                    result = -WIN_SCORE - node_depth
+                    returning = True
+                elif not is_max and _has_won(board[0]):
+                    # Prefer faster wins (add depth bonus)
+                    result = WIN_SCORE + node_depth
+                    returning = True
+                elif mask == BOARD_MASK:
+                    result = 0  # Draw
+                    returning = True
+
+            side = 0 if is_max else 1
+            extending[level] = False
+            if not returning and node_depth == 0:
+                if not in_extension[level]:
+                    # A win for the side to move on this drop outranks
+                    # everything else; score it as a win one ply deeper
+                    playable = playable_cells(mask)
+                    for col in CENTER_ORDER:
+                        cell = playable & (COLUMN_MASK << (col * HEIGHT))
+                        if cell and _has_won(board[side] | cell):
+                            result = WIN_SCORE - 1
+                            if not is_max:
+                                result = -result
+                            tt_store(tt_keys, tt_data, hashes[level],
+                                     mirror_hashes[level], result, 0, EXACT,
+                                     col, True)
+                            returning = True
+                            break
+
+                if not returning and not in_extension[level]:
+                    # Find the moves that block an immediate win by the
+                    # player who just moved
+                    threats = board[1 - side]
+                    n_blocks = 0
+                    for col in CENTER_ORDER:
+                        cell = playable & (COLUMN_MASK << (col * HEIGHT))
+                        if cell and _has_won(threats | cell):
+                            moves[level, n_blocks] = col
+                            n_blocks += 1
+                    n_moves[level] = n_blocks
+                    extending[level] = n_blocks > 0
+
+                if not returning and not extending[level]:
+                    # Base case: depth limit reached — return heuristic
+                    # estimate
+                    result = heuristic_evaluate(board[0], board[1])
+                    tt_store(tt_keys, tt_data, hashes[level],
+                             mirror_hashes[level], result, 0, EXACT, -1,
+                             not in_extension[level])
+                    returning = True
+
+            if not returning:
+                # Set up the frame, with legal moves most promising first
+                ply = _popcount(mask)
+                if not extending[level]:
+                    n_moves[level] = order_moves(moves[level], mask, tt_move,
+                                                 killers[ply], history[side])
+                next_move[level] = 0
+                plies[level] = ply
+                alphas[level] = node_alpha
+                betas[level] = node_beta
+                alpha_origs[level] = node_alpha
+                beta_origs[level] = node_beta
+                values[level] = NEG_INF if is_max else POS_INF
+                best_moves[level] = moves[level, 0]
+
+        if returning:
+            # ── Pop a finished node and back its value up ──
+            returning = False
+            if level == 0:
+                return result
+            level -= 1
+            is_max = not is_max
+            side = 0 if is_max else 1
+            col = moves[level, next_move[level] - 1]
+            pop_move(board, side, col, heights[level])
+
+            if is_max:
+                # AI's turn: maximize the evaluation
+                if result > values[level]:
+                    values[level] = result
+                    best_moves[level] = col
+                alphas[level] = max(alphas[level], result)
+            else:
+                # Opponent's turn: minimize the evaluation
+                if result < values[level]:
+                    values[level] = result
+                    best_moves[level] = col
+                betas[level] = min(betas[level], result)
+            if alphas[level] >= betas[level]:
+                # Cutoff — the other player would never allow this line
+                _record_cutoff(killers[plies[level]], history[side],
+                               col, depths[level])
+                next_move[level] = n_moves[level]
+
+        # ── Descend into the next move, or finish the node ──
+        if next_move[level] < n_moves[level]:
+            side = 0 if is_max else 1
+            col = moves[level, next_move[level]]
+            next_move[level] += 1
+            height = push_move(board, side, col)
+            heights[level] = height
+            keys = ZOBRIST[players[side] - 1, ROWS - 1 - height]
+            hashes[level + 1] = hashes[level] ^ keys[col]
+            mirror_hashes[level + 1] = (mirror_hashes[level]
+                                        ^ keys[COLS - 1 - col])
+            # An extension searches its blocking moves to depth 0 again
+            depths[level + 1] = max(depths[level] - 1, 0)
+            in_extension[level + 1] = in_extension[level] or extending[level]
+            alphas[level + 1] = alphas[level]
+            betas[level + 1] = betas[level]
+            level += 1
+            entering = True
+        else:
+            # Store the result, flagged by how it relates to the search window
+            result = values[level]
+            if result <= alpha_origs[level]:
+                flag = UPPER
+            elif result >= beta_origs[level]:
+                flag = LOWER
+            else:
+                flag = EXACT
+            tt_store(tt_keys, tt_data, hashes[level], mirror_hashes[level],
+                     result, depths[level], flag, best_moves[level],
+                     not in_extension[level])
+            returning = True